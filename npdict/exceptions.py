@@ -8,7 +8,14 @@ class DuplicatedKeyError(Exception):
     which would lead to ambiguous behavior.
     """
     def __init__(self):
-        self.message = "Duplicated keys!"
+        super().__init__()
+
+    @property
+    def message(self) -> str:
+        return "Duplicated keys!"
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class WrongArrayDimensionException(Exception):
@@ -19,7 +26,16 @@ class WrongArrayDimensionException(Exception):
     the expected number of dimensions.
     """
     def __init__(self, expected_dimension: int, given_dimensions: int):
-        self.message = f"Expected dimension: {expected_dimension}, but {given_dimensions} dimensions are given!"
+        super().__init__(expected_dimension, given_dimensions)
+        self.expected_dimension = expected_dimension
+        self.given_dimensions = given_dimensions
+
+    @property
+    def message(self) -> str:
+        return f"Expected dimension: {self.expected_dimension}, but {self.given_dimensions} dimensions are given!"
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class WrongArrayShapeException(Exception):
@@ -30,4 +46,13 @@ class WrongArrayShapeException(Exception):
     even if the number of dimensions is correct.
     """
     def __init__(self, expected_shape: tuple[int, ...], given_shape: tuple[int, ...]):
-        self.message = f"Expected shape: {', '.join(str(dim_len) for dim_len in expected_shape)}, but the given array shape is {', '.join(str(dim_len) for dim_len in given_shape)}!"
+        super().__init__(expected_shape, given_shape)
+        self.expected_shape = expected_shape
+        self.given_shape = given_shape
+
+    @property
+    def message(self) -> str:
+        return f"Expected shape: {', '.join(map(str, self.expected_shape))}, but the given array shape is {', '.join(map(str, self.given_shape))}!"
+
+    def __str__(self) -> str:
+        return self.message
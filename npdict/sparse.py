@@ -1,8 +1,8 @@
 
-from functools import reduce
-from typing import Tuple, Union
+from copy import deepcopy
+from functools import lru_cache
+from typing import Literal, Optional, Tuple, Union
 import sys
-from itertools import product
 from os import PathLike
 
 if sys.version_info < (3, 11):
@@ -11,10 +11,15 @@ else:
     from typing import Self
 
 import numpy as np
+import numpy.typing as npt
 import sparse
 
-from .wrap import NumpyNDArrayWrappedDict
-from .exceptions import DuplicatedKeyError, WrongArrayDimensionException, WrongArrayShapeException
+from .wrap import NumpyNDArrayWrappedDict, _make_indices_function
+from .exceptions import WrongArrayDimensionException, WrongArrayShapeException
+
+
+# 2-D arrays denser than this are stored in compressed sparse row format when the storage is chosen automatically
+_CSR_DENSITY_THRESHOLD = 0.1
 
 
 class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
@@ -28,12 +33,16 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
     This implementation uses sparse arrays instead of NumPy arrays, which is more memory-efficient
     for arrays with many zero values.
     """
-    __slots__ = ["_sparsearray"]
+    __slots__ = ["_sparsearray", "_storage", "_pending_writes"]
 
     def __init__(
             self,
             lists_keystrings: list[list[str]],
-            default_initial_value: float=0.0
+            default_initial_value: float=0.0,
+            *,
+            storage: Literal["dok", "coo", "csr"]="dok",
+            index_cache_maxsize: Optional[int]=4096,
+            dtype: npt.DTypeLike=np.float64
     ):
         """
         Initialize a new SparseArrayWrappedDict.
@@ -45,32 +54,138 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
             For example, [['a', 'b'], ['c', 'd']] would create a 2x2 array with keys ('a', 'c'), ('a', 'd'), ('b', 'c'), ('b', 'd').
         default_initial_value : float, optional
             The default value to fill the array with, by default 0.0.
+        storage : {"dok", "coo", "csr"}, optional
+            The sparse format of the underlying array, by default "dok". With "coo", assignments
+            are buffered and merged into the COO array in one batch when the whole array is read,
+            which suits workflows that load once and read many times. "csr" stores the array in
+            compressed sparse row format (sparse.GCXS compressed along the first axis) with the
+            same buffering, which suits arrays that are not very sparse; it needs at least two dimensions.
+        index_cache_maxsize : int, optional
+            The maximum number of key tuples whose indices are memoized for element access,
+            by default 4096. If None, the cache is unbounded; if 0, nothing is cached.
+        dtype : data-type, optional
+            The data type of the values, by default np.float64.
 
         Raises
         ------
         DuplicatedKeyError
             If there are duplicate keys in any of the lists of keys.
+        ValueError
+            If storage is not one of "dok", "coo" and "csr", or if it is "csr" for a 1-D array.
         """
-        super(dict, self).__init__()
-        for list_keystrings in lists_keystrings:
-            if (len(list_keystrings)) != len(set(list_keystrings)):
-                raise DuplicatedKeyError()
-        self._lists_keystrings = lists_keystrings
-        self._keystrings_to_indices = [
-            {
-                keyword: idx for idx, keyword in enumerate(list_keystrings)
-            }
-            for list_keystrings in self._lists_keystrings
-        ]
+        super(NumpyNDArrayWrappedDict, self).__init__()
+        if storage not in ("dok", "coo", "csr"):
+            raise ValueError(f"storage must be one of 'dok', 'coo' and 'csr', but '{storage}' is given!")
+        if storage == "csr" and len(lists_keystrings) < 2:
+            raise ValueError("storage 'csr' needs at least two dimensions; use 'dok' or 'coo' for a 1-D array!")
+        self._build_metadata(lists_keystrings)
+        self._index_cache = lru_cache(maxsize=index_cache_maxsize)(_make_indices_function(self._index_getters))
+
+        self._storage = storage
+        self._pending_writes = {}
+        if storage in ("coo", "csr"):
+            self._store_coo(
+                sparse.COO(
+                    np.empty((self._tensor_dimensions, 0), dtype=np.intp),
+                    np.empty(0, dtype=dtype),
+                    shape=tuple(self._dimension_sizes),
+                    fill_value=default_initial_value
+                )
+            )
+        else:
+            self._sparsearray = sparse.DOK(
+                tuple(self._dimension_sizes),
+                dtype=dtype,
+                fill_value=default_initial_value
+            )
+
+    def _store_coo(self, coo: sparse.COO) -> None:
+        """
+        Replace the underlying array by a COO array, converted to the storage format of this dictionary.
+
+        Parameters
+        ----------
+        coo : sparse.COO
+            The COO array holding the new values.
+        """
+        self._pending_writes = {}
+        if self._storage == "coo":
+            self._sparsearray = coo
+        elif self._storage == "csr":
+            self._sparsearray = sparse.GCXS.from_coo(coo, compressed_axes=(0,))
+        else:
+            self._sparsearray = sparse.DOK.from_coo(coo)
+
+    @staticmethod
+    def _choose_storage(shape: tuple[int, ...], nnz: int) -> str:
+        """
+        Choose the storage format for an array with a given number of non-default entries.
+
+        Parameters
+        ----------
+        shape : tuple[int, ...]
+            The shape of the array.
+        nnz : int
+            The number of non-default entries.
+
+        Returns
+        -------
+        str
+            "csr" for a 2-D array denser than the threshold, "dok" otherwise.
+        """
+        if len(shape) == 2 and nnz > _CSR_DENSITY_THRESHOLD * shape[0] * shape[1]:
+            return "csr"
+        return "dok"
+
+    def _merge_into_coo(self, new_coords: np.ndarray, new_data: np.ndarray) -> None:
+        """
+        Merge a batch of assignments into the underlying COO or CSR array.
 
-        self._tensor_dimensions = len(self._lists_keystrings)
-        self._dimension_sizes = [len(l) for l in self._lists_keystrings]
-        self._total_size = reduce(lambda a, b: a*b, self._dimension_sizes)
+        Existing entries at the assigned coordinates are overwritten, and assignments of
+        the fill value remove the entries altogether. If a coordinate is assigned more than
+        once, the last assignment wins.
 
-        self._sparsearray = sparse.DOK(
-            tuple(len(l) for l in self._lists_keystrings),
-            fill_value=default_initial_value
+        Parameters
+        ----------
+        new_coords : np.ndarray
+            An integer array of shape (number of dimensions, number of assignments).
+        new_data : np.ndarray
+            The assigned values.
+        """
+        coo = self._sparsearray if self._storage == "coo" else self._sparsearray.tocoo()
+        new_flat_indices = np.ravel_multi_index(new_coords, coo.shape)
+        _, last_positions = np.unique(new_flat_indices[::-1], return_index=True)
+        last_positions = len(new_flat_indices) - 1 - last_positions
+        new_coords = new_coords[:, last_positions]
+        new_data = new_data[last_positions]
+
+        kept = ~np.isin(
+            np.ravel_multi_index(coo.coords, coo.shape),
+            new_flat_indices[last_positions]
+        )
+        nondefault = new_data != coo.fill_value
+        self._store_coo(
+            sparse.COO(
+                np.concatenate([coo.coords[:, kept], new_coords[:, nondefault]], axis=1),
+                np.concatenate([coo.data[kept], new_data[nondefault]]),
+                shape=coo.shape,
+                has_duplicates=False,
+                fill_value=coo.fill_value
+            )
+        )
+
+    def _flush_pending_writes(self) -> None:
+        """
+        Merge the buffered assignments into the underlying COO or CSR array in one batch.
+        """
+        if len(self._pending_writes) == 0:
+            return
+        nbwrites = len(self._pending_writes)
+        self._merge_into_coo(
+            np.array(list(self._pending_writes.keys()), dtype=np.intp).reshape(nbwrites, self._tensor_dimensions).T,
+            np.fromiter(self._pending_writes.values(), dtype=self._sparsearray.dtype, count=nbwrites)
         )
+        self._pending_writes = {}
 
     def __getitem__(self, item: Union[Tuple[str, ...], str]) -> float:
         """
@@ -92,14 +207,16 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
             If the number of keys does not match the number of dimensions in the array.
         """
         if isinstance(item, tuple):
-            if len(item) != self.tensor_dimensions:
-                raise WrongArrayDimensionException(self.tensor_dimensions, len(item))
+            if len(item) != self._tensor_dimensions:
+                raise WrongArrayDimensionException(self._tensor_dimensions, len(item))
         else:
-            if self.tensor_dimensions != 1:
-                raise WrongArrayDimensionException(self.tensor_dimensions, 1)
-            item = (item,)
-        indices = self._get_indices(item)
-        return self._sparsearray[tuple(indices)]
+            if self._tensor_dimensions != 1:
+                raise WrongArrayDimensionException(self._tensor_dimensions, 1)
+        indices = self._index_cache(item)
+        if self._storage != "dok" and len(self._pending_writes) > 0:
+            if indices in self._pending_writes:
+                return self._pending_writes[indices]
+        return self._sparsearray[indices]
 
     def __setitem__(self, key: Union[Tuple[str, ...], str], value: float) -> None:
         """
@@ -118,14 +235,68 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
             If the number of keys does not match the number of dimensions in the array.
         """
         if isinstance(key, tuple):
-            if len(key) != self.tensor_dimensions:
-                raise WrongArrayDimensionException(self.tensor_dimensions, len(key))
+            if len(key) != self._tensor_dimensions:
+                raise WrongArrayDimensionException(self._tensor_dimensions, len(key))
+        else:
+            if self._tensor_dimensions != 1:
+                raise WrongArrayDimensionException(self._tensor_dimensions, 1)
+        indices = self._index_cache(key)
+        if self._storage == "dok":
+            self._sparsearray[indices] = value
+        else:
+            # cast on write, so that buffered values read back as stored ones, and bad values fail here
+            self._pending_writes[indices] = self._sparsearray.dtype.type(value)
+
+    def get_many(self, keys: list[Union[Tuple[str, ...], str]]) -> np.ndarray:
+        """
+        Get the values at many keys at once.
+
+        Parameters
+        ----------
+        keys : list[Tuple[str, ...] | str]
+            A list of tuples of string keys, one for each dimension of the array.
+
+        Returns
+        -------
+        np.ndarray
+            A one-dimensional array of the values at the given keys, in the same order.
+
+        Raises
+        ------
+        WrongArrayDimensionException
+            If the number of keys in any of the tuples does not match the number of dimensions in the array.
+        """
+        coords = self._get_coords(keys)
+        sparsearray = self._sparsearray if self._storage == "dok" else self.to_coo()
+        return sparsearray[tuple(coords)].todense()
+
+    def set_many(
+            self,
+            keys: list[Union[Tuple[str, ...], str]],
+            values: Union[np.ndarray, list[float], float]
+    ) -> None:
+        """
+        Set the values at many keys at once.
+
+        Parameters
+        ----------
+        keys : list[Tuple[str, ...] | str]
+            A list of tuples of string keys, one for each dimension of the array.
+        values : np.ndarray | list[float] | float
+            The values to set at the given keys, in the same order, or a single value for all of them.
+
+        Raises
+        ------
+        WrongArrayDimensionException
+            If the number of keys in any of the tuples does not match the number of dimensions in the array.
+        """
+        coords = self._get_coords(keys)
+        values = np.broadcast_to(np.asarray(values, dtype=self._sparsearray.dtype), (coords.shape[1],))
+        if self._storage == "dok":
+            self._sparsearray[tuple(coords)] = values
         else:
-            if self.tensor_dimensions != 1:
-                raise WrongArrayDimensionException(self.tensor_dimensions, 1)
-            key = (key,)
-        indices = self._get_indices(key)
-        self._sparsearray[tuple(indices)] = value
+            self._flush_pending_writes()
+            self._merge_into_coo(coords, values)
 
     def to_numpy(self) -> np.ndarray:
         """
@@ -136,6 +307,7 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
         np.ndarray
             A dense NumPy array containing the values of the sparse array.
         """
+        self._flush_pending_writes()
         return self._sparsearray.todense()
 
     def to_coo(self) -> sparse.COO:
@@ -146,8 +318,12 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
         -------
         sparse.COO
             A COO format sparse array containing the same values as the wrapped array.
+            With "coo" storage, this is the underlying array itself.
         """
-        return self._sparsearray.to_coo()
+        if self._storage == "dok":
+            return self._sparsearray.to_coo()
+        self._flush_pending_writes()
+        return self._sparsearray if self._storage == "coo" else self._sparsearray.tocoo()
 
     def to_dok(self) -> sparse.DOK:
         """
@@ -156,14 +332,17 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
         Returns
         -------
         sparse.DOK
-            The underlying DOK format sparse array.
+            The underlying DOK format sparse array. With "coo" or "csr" storage, a DOK copy of the underlying array.
         """
-        return self._sparsearray
+        if self._storage == "dok":
+            return self._sparsearray
+        return sparse.DOK.from_coo(self.to_coo())
 
     def generate_dict(
             self,
             new_array: Union[np.ndarray, sparse.SparseArray],
-            dense: bool=False
+            dense: bool=False,
+            prefer_coo: bool=True
     ) -> Self:
         """
         Generate a new dictionary with the same keys but different values.
@@ -175,6 +354,9 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
         dense : bool, optional
             If True, returns a NumpyNDArrayWrappedDict. If False, returns a SparseArrayWrappedDict.
             Default is False.
+        prefer_coo : bool, optional
+            If True, a SparseArrayWrappedDict generated from a NumPy array or a non-DOK sparse array
+            keeps it in COO storage instead of converting it to DOK element by element. Default is True.
 
         Returns
         -------
@@ -193,17 +375,67 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
         if new_array.shape != self._sparsearray.shape:
             raise WrongArrayShapeException(self._sparsearray.shape, new_array.shape)
         if dense:
-            wrapped_dict = NumpyNDArrayWrappedDict(self._lists_keystrings)
+            wrapped_dict = NumpyNDArrayWrappedDict(self._lists_keystrings, _skip_fill=True)
             if isinstance(new_array, sparse.SparseArray):
-                wrapped_dict._numpyarray = new_array.todense()
+                wrapped_dict._set_numpyarray(new_array.todense())
             else:
-                wrapped_dict._numpyarray = new_array
+                wrapped_dict._set_numpyarray(new_array)
         else:
-            wrapped_dict = SparseArrayWrappedDict(self._lists_keystrings)
-            if isinstance(new_array, sparse.SparseArray):
-                wrapped_dict._sparsearray = new_array if isinstance(new_array, sparse.DOK) else sparse.DOK(new_array)
+            # the keys are already validated, so they are shared instead of being processed again
+            wrapped_dict = object.__new__(SparseArrayWrappedDict)
+            self._copy_metadata(wrapped_dict)
+            if isinstance(new_array, sparse.DOK):
+                wrapped_dict._storage = "dok"
+                wrapped_dict._pending_writes = {}
+                wrapped_dict._sparsearray = new_array
             else:
-                wrapped_dict._sparsearray = sparse.DOK(new_array)
+                wrapped_dict._storage = "coo" if prefer_coo else "dok"
+                if isinstance(new_array, sparse.SparseArray):
+                    wrapped_dict._store_coo(new_array.asformat("coo"))
+                else:
+                    wrapped_dict._store_coo(sparse.COO.from_numpy(new_array))
+        return wrapped_dict
+
+    def __copy__(self) -> Self:
+        """
+        Create a shallow copy of the dictionary, which shares the underlying sparse array.
+
+        The buffered assignments are merged first, so that both dictionaries see them.
+
+        Returns
+        -------
+        SparseArrayWrappedDict
+            A new SparseArrayWrappedDict with the same keys, holding the same sparse array.
+        """
+        self._flush_pending_writes()
+        wrapped_dict = object.__new__(SparseArrayWrappedDict)
+        self._copy_metadata(wrapped_dict)
+        wrapped_dict._storage = self._storage
+        wrapped_dict._pending_writes = {}
+        wrapped_dict._sparsearray = self._sparsearray
+        return wrapped_dict
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        """
+        Create a deep copy of the dictionary, with its own copy of the underlying sparse array.
+
+        Parameters
+        ----------
+        memo : dict
+            The memo dictionary of ``copy.deepcopy``.
+
+        Returns
+        -------
+        SparseArrayWrappedDict
+            A new SparseArrayWrappedDict with the same keys and values.
+        """
+        wrapped_dict = object.__new__(SparseArrayWrappedDict)
+        memo[id(self)] = wrapped_dict
+        self._copy_metadata(wrapped_dict)
+        wrapped_dict._index_cache = self._new_index_cache()
+        wrapped_dict._storage = self._storage
+        wrapped_dict._pending_writes = dict(self._pending_writes)
+        wrapped_dict._sparsearray = deepcopy(self._sparsearray, memo)
         return wrapped_dict
 
     def is_sparse(self) -> bool:
@@ -229,12 +461,27 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
         """
         return f"<SparseArrayWrappedDict: dimensions ({', '.join(map(str, self.dimension_sizes))})>"
 
+    @property
+    def storage(self) -> str:
+        """
+        Get the sparse format of the underlying array.
+
+        Returns
+        -------
+        str
+            One of "dok", "coo" and "csr".
+        """
+        return self._storage
+
     @classmethod
     def from_dict_given_keywords(
             cls,
             lists_keywords: list[list[str]],
             oridict: dict[Tuple[str, ...], float],
-            default_initial_value: float = 0.0
+            default_initial_value: float = 0.0,
+            *,
+            storage: Literal["dok", "coo", "csr", "auto"] = "dok",
+            dtype: npt.DTypeLike = np.float64
     ) -> Self:
         """
         Create a new SparseArrayWrappedDict from a standard Python dictionary with given keywords.
@@ -247,25 +494,56 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
             A standard Python dictionary with keys as tuples of strings and values as floats.
         default_initial_value : float, optional
             The default value to fill the array with for keys not present in oridict, by default 0.0.
+        storage : {"dok", "coo", "csr", "auto"}, optional
+            The sparse format of the underlying array, by default "dok". With "auto", "csr" is chosen
+            for a 2-D array with more than 10% non-default entries, and "dok" otherwise.
+            "csr" needs at least two dimensions.
+        dtype : data-type, optional
+            The data type of the values, by default np.float64.
 
         Returns
         -------
         SparseArrayWrappedDict
             A new SparseArrayWrappedDict with the same keys and values as oridict.
+
+        Raises
+        ------
+        ValueError
+            If storage is not one of "dok", "coo", "csr" and "auto", or if it is "csr" for a 1-D array.
         """
         wrapped_dict = SparseArrayWrappedDict(
             lists_keywords,
-            default_initial_value=default_initial_value
+            default_initial_value=default_initial_value,
+            storage="dok" if storage == "auto" else storage,
+            dtype=dtype
+        )
+
+        # only the non-default entries of oridict are stored
+        entries = wrapped_dict._get_nondefault_entries(oridict, default_initial_value)
+        coords = wrapped_dict._get_coords([keywords_tuple for keywords_tuple, _ in entries])
+        data = np.fromiter((value for _, value in entries), dtype=dtype, count=len(entries))
+        if storage == "auto":
+            wrapped_dict._storage = SparseArrayWrappedDict._choose_storage(
+                tuple(wrapped_dict.dimension_sizes),
+                len(entries)
+            )
+        wrapped_dict._store_coo(
+            sparse.COO(
+                coords,
+                data,
+                shape=tuple(wrapped_dict.dimension_sizes),
+                fill_value=default_initial_value
+            )
         )
-        for keywords_tuple in product(*lists_keywords):
-            wrapped_dict[keywords_tuple] = oridict.get(keywords_tuple, default_initial_value)
         return wrapped_dict
 
     @classmethod
     def from_NumpyNDArrayWrappedDict(
             cls,
             npwrapped_dict: NumpyNDArrayWrappedDict,
-            default_initial_value: float = 0.0
+            default_initial_value: float = 0.0,
+            *,
+            storage: Literal["dok", "coo", "csr", "auto"] = "dok"
     ) -> Self:
         """
         Create a new SparseArrayWrappedDict from a NumpyNDArrayWrappedDict.
@@ -279,32 +557,48 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
             The NumpyNDArrayWrappedDict to convert. Must not be a SparseArrayWrappedDict.
         default_initial_value : float, optional
             The default value to fill the sparse array with, by default 0.0.
+        storage : {"dok", "coo", "csr", "auto"}, optional
+            The sparse format of the underlying array, by default "dok". With "auto", "csr" is chosen
+            for a 2-D array with more than 10% non-default entries, and "dok" otherwise.
+            "csr" needs at least two dimensions.
 
         Returns
         -------
         SparseArrayWrappedDict
-            A new SparseArrayWrappedDict with the same keys and values as the input dictionary.
+            A new SparseArrayWrappedDict with the same keys and values as the input dictionary,
+            and of the same data type.
 
         Raises
         ------
         TypeError
             If the input dictionary is already a SparseArrayWrappedDict.
+        ValueError
+            If storage is not one of "dok", "coo", "csr" and "auto", or if it is "csr" for a 1-D array.
         """
-        try:
-            assert not isinstance(npwrapped_dict, SparseArrayWrappedDict)
-        except AssertionError:
+        if isinstance(npwrapped_dict, SparseArrayWrappedDict):
             raise TypeError("The npwrapped_dict must not be a SparseArrayWrappedDict.")
 
+        # settle the storage before construction instead of switching it afterwards
+        nparray = npwrapped_dict.to_numpy()
+        mask = nparray != default_initial_value
+        if storage == "auto":
+            storage = SparseArrayWrappedDict._choose_storage(nparray.shape, np.count_nonzero(mask))
         sparse_array_wrapped_dict = SparseArrayWrappedDict(
             npwrapped_dict._lists_keystrings,
-            default_initial_value=default_initial_value
+            default_initial_value=default_initial_value,
+            storage=storage,
+            dtype=nparray.dtype
         )
-        sparse_array_wrapped_dict._sparsearray = sparse.DOK(
-            tuple(npwrapped_dict.dimension_sizes),
-            fill_value=default_initial_value
+        sparse_array_wrapped_dict._store_coo(
+            sparse.COO(
+                np.array(np.nonzero(mask), dtype=np.intp),
+                nparray[mask],
+                shape=nparray.shape,
+                has_duplicates=False,
+                sorted=True,
+                fill_value=default_initial_value
+            )
         )
-        for keywords_tuple in product(*npwrapped_dict._lists_keystrings):
-            sparse_array_wrapped_dict[keywords_tuple] = npwrapped_dict[keywords_tuple]
         return sparse_array_wrapped_dict
 
     @classmethod
@@ -382,13 +676,14 @@ class SparseArrayWrappedDict(NumpyNDArrayWrappedDict):
         return sparse_array_wrapped_dict
 
     def save(self, filepath: Union[str, PathLike]) -> None:
+        coo = self.to_coo()
         np.save(
             filepath,
             {
                 "lists_of_strings": self._lists_keystrings,
-                "shape": self._sparsearray.shape,
-                "coords": self._sparsearray.to_coo().coords,
-                "data": self._sparsearray.to_coo().data
+                "shape": coo.shape,
+                "coords": coo.coords,
+                "data": coo.data
             }
         )
 
@@ -1,11 +1,15 @@
 
-from typing import Generator, Optional, Union
+from typing import Callable, Iterator, Optional, Union
 import sys
+from collections.abc import KeysView, Mapping
 from itertools import product
-from functools import reduce
+from copy import deepcopy
+from functools import lru_cache
+from math import prod
 from os import PathLike
 
 import numpy as np
+import numpy.typing as npt
 if sys.version_info < (3, 11):
     from typing_extensions import Self
 else:
@@ -14,23 +18,148 @@ else:
 from .exceptions import DuplicatedKeyError, WrongArrayDimensionException, WrongArrayShapeException
 
 
-class NumpyNDArrayWrappedDict(dict):
+def _intern_keystrings(lists_keystrings: list[list[str]]) -> tuple[tuple[str, ...], ...]:
+    """
+    Freeze the lists of keys into tuples, interning the keys that are plain strings.
+
+    Interned keys are shared by the mappings and by the key tuples built from them, so
+    dictionary lookups with those keys succeed on identity without comparing the characters.
+    String subclasses (such as ``np.str_``) cannot be interned and are kept as they are.
+
+    Parameters
+    ----------
+    lists_keystrings : list[list[str]]
+        A list of lists of strings, where each inner list contains the keys for one dimension of the array.
+
+    Returns
+    -------
+    tuple[tuple[str, ...], ...]
+        The keys of each dimension, in the same order.
+    """
+    return tuple(
+        tuple(sys.intern(keyword) if type(keyword) is str else keyword for keyword in list_keystrings)
+        for list_keystrings in lists_keystrings
+    )
+
+
+def _make_indices_function(
+        index_getters: tuple[Callable[[str], int], ...]
+) -> Callable[[Union[tuple[str, ...], str]], tuple[int, ...]]:
+    """
+    Build the function converting a tuple of string keys to a tuple of integer indices.
+
+    The function only holds the lookups of the mappings, not the dictionary, so that memoizing
+    it on the dictionary does not create a reference cycle.
+
+    Parameters
+    ----------
+    index_getters : tuple[Callable[[str], int], ...]
+        The lookups of the key-to-index mappings, one for each dimension.
+
+    Returns
+    -------
+    Callable[[Tuple[str, ...] | str], tuple[int, ...]]
+        A function taking a tuple of string keys, or a bare key for a one-dimensional array,
+        and returning the tuple of integer indices.
+    """
+    if len(index_getters) == 2:
+        getter0, getter1 = index_getters
+
+        def get_indices(item):
+            return getter0(item[0]), getter1(item[1])
+    else:
+        def get_indices(item):
+            if not isinstance(item, tuple):
+                item = (item,)
+            return tuple(getter(keyword) for getter, keyword in zip(index_getters, item))
+    return get_indices
+
+
+def _make_offset_function(
+        index_getters: tuple[Callable[[str], int], ...],
+        strides: tuple[int, ...]
+) -> Callable[[Union[tuple[str, ...], str]], int]:
+    """
+    Build the function converting a tuple of string keys to the position of the element in the flattened array.
+
+    Keys of up to four dimensions are translated by unrolled functions, without building a tuple
+    of indices. Like in _make_indices_function, the function does not hold the dictionary.
+
+    Parameters
+    ----------
+    index_getters : tuple[Callable[[str], int], ...]
+        The lookups of the key-to-index mappings, one for each dimension.
+    strides : tuple[int, ...]
+        The element strides of the C-order layout of the array.
+
+    Returns
+    -------
+    Callable[[Tuple[str, ...] | str], int]
+        A function taking a tuple of string keys, or a bare key for a one-dimensional array,
+        and returning the position of the element in the flattened (C-order) array.
+    """
+    nbdims = len(index_getters)
+    if nbdims == 1:
+        getter0, = index_getters
+
+        def get_offset(item):
+            return getter0(item[0] if isinstance(item, tuple) else item)
+    elif nbdims == 2:
+        getter0, getter1 = index_getters
+        stride0, _ = strides
+
+        def get_offset(item):
+            return getter0(item[0]) * stride0 + getter1(item[1])
+    elif nbdims == 3:
+        getter0, getter1, getter2 = index_getters
+        stride0, stride1, _ = strides
+
+        def get_offset(item):
+            return getter0(item[0]) * stride0 + getter1(item[1]) * stride1 + getter2(item[2])
+    elif nbdims == 4:
+        getter0, getter1, getter2, getter3 = index_getters
+        stride0, stride1, stride2, _ = strides
+
+        def get_offset(item):
+            return (
+                getter0(item[0]) * stride0
+                + getter1(item[1]) * stride1
+                + getter2(item[2]) * stride2
+                + getter3(item[3])
+            )
+    else:
+        def get_offset(item):
+            offset = 0
+            for getter, keyword, stride in zip(index_getters, item, strides):
+                offset += getter(keyword) * stride
+            return offset
+    return get_offset
+
+
+class NumpyNDArrayWrappedDict(Mapping):
     """
     A dictionary-like class that wraps a NumPy n-dimensional array.
 
     This class provides a dictionary interface to a NumPy array, where the keys are tuples of strings
     and the values are the corresponding elements in the array. The class maintains a mapping between
     string keys and array indices, allowing for more intuitive access to array elements.
+    It implements the read-only mapping protocol of ``collections.abc.Mapping``, with item assignment
+    on top; all the values live in the array.
     """
     __slots__ = [
         "_lists_keystrings", "_keystrings_to_indices", "_tensor_dimensions",
-        "_dimension_sizes", "_total_size", "_numpyarray"
+        "_dimension_sizes", "_total_size", "_numpyarray", "_index_getters", "_index_cache",
+        "_strides", "_flat"
     ]
 
     def __init__(
             self,
             lists_keystrings: list[list[str]],
-            default_initial_value: float=0.0
+            default_initial_value: float=0.0,
+            *,
+            index_cache_maxsize: Optional[int]=4096,
+            dtype: npt.DTypeLike=np.float64,
+            _skip_fill: bool=False
     ):
         """
         Initialize a new NumpyNDArrayWrappedDict.
@@ -42,49 +171,244 @@ class NumpyNDArrayWrappedDict(dict):
             For example, [['a', 'b'], ['c', 'd']] would create a 2x2 array with keys ('a', 'c'), ('a', 'd'), ('b', 'c'), ('b', 'd').
         default_initial_value : float, optional
             The default value to fill the array with, by default 0.0.
+        index_cache_maxsize : int, optional
+            The maximum number of key tuples whose indices are memoized for element access,
+            by default 4096. If None, the cache is unbounded; if 0, nothing is cached.
+        dtype : data-type, optional
+            The data type of the values, by default np.float64. A smaller type such as np.float32
+            halves the memory of the array. The array returned by to_numpy() has this type.
+        _skip_fill : bool, optional
+            For internal use: if True, the array is left uninitialized, because the caller replaces
+            or overwrites it right away. By default False.
 
         Raises
         ------
         DuplicatedKeyError
             If there are duplicate keys in any of the lists of keys.
         """
-        super(dict, self).__init__()
-        for list_keystrings in lists_keystrings:
-            if (len(list_keystrings)) != len(set(list_keystrings)):
-                raise DuplicatedKeyError()
-        self._lists_keystrings = lists_keystrings
-        self._keystrings_to_indices = [
-            {
-                keyword: idx for idx, keyword in enumerate(list_keystrings)
-            }
-            for list_keystrings in self._lists_keystrings
-        ]
+        super().__init__()
+        self._build_metadata(lists_keystrings)
+        self._index_cache = lru_cache(maxsize=index_cache_maxsize)(
+            _make_offset_function(self._index_getters, self._strides)
+        )
+
+        if _skip_fill:
+            self._set_numpyarray(np.empty(tuple(self._dimension_sizes), dtype=dtype))
+        else:
+            self._set_numpyarray(np.full(tuple(self._dimension_sizes), default_initial_value, dtype=dtype))
+
+    def _build_metadata(self, lists_keystrings: list[list[str]]) -> None:
+        """
+        Validate the keys and build the key-to-index mappings, the dimension sizes and the strides.
+
+        Parameters
+        ----------
+        lists_keystrings : list[list[str]]
+            A list of lists of strings, where each inner list contains the keys for one dimension of the array.
+
+        Raises
+        ------
+        DuplicatedKeyError
+            If there are duplicate keys in any of the lists of keys.
+        """
+        self._lists_keystrings = _intern_keystrings(lists_keystrings)
+        keystrings_to_indices = []
+        for list_keystrings in self._lists_keystrings:
+            # the mapping doubles as the seen-set, so that the check stops at the first duplicate
+            mapping = {}
+            for idx, keyword in enumerate(list_keystrings):
+                if keyword in mapping:
+                    raise DuplicatedKeyError()
+                mapping[keyword] = idx
+            keystrings_to_indices.append(mapping)
+        self._keystrings_to_indices = tuple(keystrings_to_indices)
+        self._index_getters = tuple(mapping.__getitem__ for mapping in self._keystrings_to_indices)
 
         self._tensor_dimensions = len(self._lists_keystrings)
         self._dimension_sizes = [len(l) for l in self._lists_keystrings]
-        self._total_size = reduce(lambda a, b: a*b, self._dimension_sizes)
+        self._total_size = prod(self._dimension_sizes)
 
-        self._numpyarray = np.empty(tuple(len(l) for l in self._lists_keystrings))
-        self._numpyarray.fill(default_initial_value)
+        # element strides of the C-order layout, so that an element sits at the dot product of its indices and the strides
+        strides = [1] * self._tensor_dimensions
+        for dim in range(self._tensor_dimensions - 2, -1, -1):
+            strides[dim] = strides[dim + 1] * self._dimension_sizes[dim + 1]
+        self._strides = tuple(strides)
 
-    def _get_indices(self, item: tuple[str, ...]) -> list[int]:
+    def _set_numpyarray(self, nparray: np.ndarray) -> None:
         """
-        Convert a tuple of string keys to a list of integer indices.
+        Set the underlying NumPy array, together with its flattened view used for element access.
 
         Parameters
         ----------
-        item : Tuple[str, ...]
-            A tuple of string keys, one for each dimension of the array.
+        nparray : np.ndarray
+            The NumPy array holding the values. It is kept as it is, so that writes reach it.
+            If it is not C-contiguous, the elements are accessed through its flat iterator,
+            which also follows the C order.
+        """
+        self._numpyarray = nparray
+        self._flat = nparray.reshape(-1) if nparray.flags.c_contiguous else nparray.flat
+
+    def _copy_metadata(self, wrapped_dict: "NumpyNDArrayWrappedDict") -> None:
+        """
+        Share the keys and the index translation of this dictionary with a new, uninitialized one.
+
+        The metadata is immutable, except for the list of dimension sizes, which is copied, and the
+        memoized translation does not refer to this dictionary, so sharing it does not keep this
+        dictionary alive. Nothing is validated, so the new dictionary must be of the same class as this one.
+
+        Parameters
+        ----------
+        wrapped_dict : NumpyNDArrayWrappedDict
+            A dictionary created with ``object.__new__``, whose array is set by the caller.
+        """
+        wrapped_dict._lists_keystrings = self._lists_keystrings
+        wrapped_dict._keystrings_to_indices = self._keystrings_to_indices
+        wrapped_dict._index_getters = self._index_getters
+        wrapped_dict._tensor_dimensions = self._tensor_dimensions
+        wrapped_dict._dimension_sizes = list(self._dimension_sizes)
+        wrapped_dict._total_size = self._total_size
+        wrapped_dict._strides = self._strides
+        wrapped_dict._index_cache = self._index_cache
+
+    def _new_index_cache(self) -> Callable[[Union[tuple[str, ...], str]], int]:
+        """
+        Create an empty cache around the key translation of this dictionary, of the same size.
 
         Returns
         -------
-        list[int]
-            A list of integer indices corresponding to the string keys.
+        Callable[[Tuple[str, ...] | str], int]
+            The memoized key translation.
+        """
+        return lru_cache(maxsize=self._index_cache.cache_parameters()["maxsize"])(self._index_cache.__wrapped__)
+
+    def __copy__(self) -> Self:
+        """
+        Create a shallow copy of the dictionary, which shares the underlying array.
+
+        Returns
+        -------
+        NumpyNDArrayWrappedDict
+            A new NumpyNDArrayWrappedDict with the same keys, holding the same array.
+        """
+        wrapped_dict = object.__new__(NumpyNDArrayWrappedDict)
+        self._copy_metadata(wrapped_dict)
+        wrapped_dict._set_numpyarray(self._numpyarray)
+        return wrapped_dict
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        """
+        Create a deep copy of the dictionary, with its own copy of the underlying array.
+
+        Parameters
+        ----------
+        memo : dict
+            The memo dictionary of ``copy.deepcopy``.
+
+        Returns
+        -------
+        NumpyNDArrayWrappedDict
+            A new NumpyNDArrayWrappedDict with the same keys and values.
         """
-        return [
-            mapping[keyword]
-            for mapping, keyword in zip(self._keystrings_to_indices, item)
-        ]
+        wrapped_dict = object.__new__(NumpyNDArrayWrappedDict)
+        memo[id(self)] = wrapped_dict
+        self._copy_metadata(wrapped_dict)
+        wrapped_dict._index_cache = self._new_index_cache()
+        wrapped_dict._set_numpyarray(deepcopy(self._numpyarray, memo))
+        return wrapped_dict
+
+    def _get_coords(self, keys: list[Union[tuple[str, ...], str]]) -> np.ndarray:
+        """
+        Convert a list of key tuples to an array of integer coordinates.
+
+        Parameters
+        ----------
+        keys : list[Tuple[str, ...] | str]
+            A list of tuples of string keys, one for each dimension of the array.
+
+        Returns
+        -------
+        np.ndarray
+            An integer array of shape (number of dimensions, number of keys), whose columns
+            are the indices corresponding to the keys.
+
+        Raises
+        ------
+        WrongArrayDimensionException
+            If the number of keys in any of the tuples does not match the number of dimensions in the array.
+        """
+        nbdims = self._tensor_dimensions
+        if nbdims == 1:
+            keys = [key if isinstance(key, tuple) else (key,) for key in keys]
+        elif set(map(type, keys)) - {tuple}:
+            for key in keys:
+                if not isinstance(key, tuple):
+                    raise WrongArrayDimensionException(nbdims, 1)
+        if set(map(len, keys)) - {nbdims}:
+            raise WrongArrayDimensionException(nbdims, next(len(key) for key in keys if len(key) != nbdims))
+
+        # translate column by column, so that each dimension is one pass of dict lookups over its labels
+        nbkeys = len(keys)
+        coords = np.empty((nbdims, nbkeys), dtype=np.intp)
+        if nbkeys > 0:
+            for dim, (getter, column) in enumerate(zip(self._index_getters, zip(*keys))):
+                coords[dim] = np.fromiter(map(getter, column), dtype=np.intp, count=nbkeys)
+        return coords
+
+    def _get_nondefault_entries(
+            self,
+            oridict: dict[tuple[str, ...], float],
+            default_initial_value: float
+    ) -> list[tuple[tuple[str, ...], float]]:
+        """
+        Select the entries of a dictionary that have to be written into the array.
+
+        Parameters
+        ----------
+        oridict : dict[Tuple[str, ...], float]
+            A standard Python dictionary with keys as tuples of strings and values as floats.
+        default_initial_value : float
+            The default value of the array; entries with this value are left out.
+
+        Returns
+        -------
+        list[Tuple[Tuple[str, ...], float]]
+            The key-value pairs of oridict whose values differ from the default value and whose keys
+            are tuples of keys that are all among the keys of this dictionary. Other keys, including
+            bare strings, are ignored.
+        """
+        mappings = self._keystrings_to_indices
+        nbdims = self._tensor_dimensions
+        if nbdims == 1:
+            mapping0, = mappings
+            entries = [
+                (keywords_tuple, value)
+                for keywords_tuple, value in oridict.items()
+                if value != default_initial_value
+                and isinstance(keywords_tuple, tuple)
+                and len(keywords_tuple) == 1
+                and keywords_tuple[0] in mapping0
+            ]
+        elif nbdims == 2:
+            mapping0, mapping1 = mappings
+            entries = [
+                (keywords_tuple, value)
+                for keywords_tuple, value in oridict.items()
+                if value != default_initial_value
+                and isinstance(keywords_tuple, tuple)
+                and len(keywords_tuple) == 2
+                and keywords_tuple[0] in mapping0
+                and keywords_tuple[1] in mapping1
+            ]
+        else:
+            entries = [
+                (keywords_tuple, value)
+                for keywords_tuple, value in oridict.items()
+                if value != default_initial_value
+                and isinstance(keywords_tuple, tuple)
+                and len(keywords_tuple) == nbdims
+                and all(keyword in mapping for mapping, keyword in zip(mappings, keywords_tuple))
+            ]
+        return entries
 
     def __getitem__(self, item: Union[tuple[str, ...], str]) -> float:
         """
@@ -106,14 +430,12 @@ class NumpyNDArrayWrappedDict(dict):
             If the number of keys does not match the number of dimensions in the array.
         """
         if isinstance(item, tuple):
-            if len(item) != self.tensor_dimensions:
-                raise WrongArrayDimensionException(self.tensor_dimensions, len(item))
+            if len(item) != self._tensor_dimensions:
+                raise WrongArrayDimensionException(self._tensor_dimensions, len(item))
         else:
-            if self.tensor_dimensions != 1:
-                raise WrongArrayDimensionException(self.tensor_dimensions, 1)
-            item = (item,)
-        indices = self._get_indices(item)
-        return self._numpyarray[tuple(indices)]
+            if self._tensor_dimensions != 1:
+                raise WrongArrayDimensionException(self._tensor_dimensions, 1)
+        return self._flat[self._index_cache(item)]
 
     def __setitem__(self, key: Union[tuple[str, ...], str], value: float) -> None:
         """
@@ -132,14 +454,105 @@ class NumpyNDArrayWrappedDict(dict):
             If the number of keys does not match the number of dimensions in the array.
         """
         if isinstance(key, tuple):
-            if len(key) != self.tensor_dimensions:
-                raise WrongArrayDimensionException(self.tensor_dimensions, len(key))
+            if len(key) != self._tensor_dimensions:
+                raise WrongArrayDimensionException(self._tensor_dimensions, len(key))
         else:
-            if self.tensor_dimensions != 1:
-                raise WrongArrayDimensionException(self.tensor_dimensions, 1)
-            key = (key,)
-        indices = self._get_indices(key)
-        self._numpyarray[tuple(indices)] = value
+            if self._tensor_dimensions != 1:
+                raise WrongArrayDimensionException(self._tensor_dimensions, 1)
+        self._flat[self._index_cache(key)] = value
+
+    def _get_offsets(self, keys: list[Union[tuple[str, ...], str]]) -> np.ndarray:
+        """
+        Convert a list of key tuples to the positions of the elements in the flattened array.
+
+        Parameters
+        ----------
+        keys : list[Tuple[str, ...] | str]
+            A list of tuples of string keys, one for each dimension of the array.
+
+        Returns
+        -------
+        np.ndarray
+            A one-dimensional integer array of the positions of the elements in the flattened (C-order) array.
+
+        Raises
+        ------
+        WrongArrayDimensionException
+            If the number of keys in any of the tuples does not match the number of dimensions in the array.
+        """
+        return np.asarray(self._strides, dtype=np.intp) @ self._get_coords(keys)
+
+    def get_many(self, keys: list[Union[tuple[str, ...], str]]) -> np.ndarray:
+        """
+        Get the values at many keys at once.
+
+        Parameters
+        ----------
+        keys : list[Tuple[str, ...] | str]
+            A list of tuples of string keys, one for each dimension of the array.
+
+        Returns
+        -------
+        np.ndarray
+            A one-dimensional array of the values at the given keys, in the same order.
+
+        Raises
+        ------
+        WrongArrayDimensionException
+            If the number of keys in any of the tuples does not match the number of dimensions in the array.
+        """
+        # take and put index in C order whatever the memory layout of the array
+        return self._numpyarray.take(self._get_offsets(keys))
+
+    def set_many(
+            self,
+            keys: list[Union[tuple[str, ...], str]],
+            values: Union[np.ndarray, list[float], float]
+    ) -> None:
+        """
+        Set the values at many keys at once.
+
+        Parameters
+        ----------
+        keys : list[Tuple[str, ...] | str]
+            A list of tuples of string keys, one for each dimension of the array.
+            If a key appears more than once, the last of its values is kept.
+        values : np.ndarray | list[float] | float
+            The values to set at the given keys, in the same order, or a single value for all of them.
+
+        Raises
+        ------
+        WrongArrayDimensionException
+            If the number of keys in any of the tuples does not match the number of dimensions in the array.
+        """
+        offsets = self._get_offsets(keys)
+        values = np.broadcast_to(np.asarray(values, dtype=self._numpyarray.dtype), offsets.shape)
+        self._numpyarray.put(offsets, values)
+
+    def __contains__(self, item: object) -> bool:
+        """
+        Check whether a key is in the dictionary.
+
+        Parameters
+        ----------
+        item : object
+            A tuple of string keys, one for each dimension of the array, or a bare string key
+            for a one-dimensional array.
+
+        Returns
+        -------
+        bool
+            True if every string key is among the keys of its dimension, False otherwise.
+        """
+        if not isinstance(item, tuple):
+            item = (item,)
+        if len(item) != self._tensor_dimensions:
+            return False
+        try:
+            return all(keyword in mapping for mapping, keyword in zip(self._keystrings_to_indices, item))
+        except TypeError:
+            # unhashable keywords cannot be keys
+            return False
 
     def update(self, new_dict: dict):
         """
@@ -152,28 +565,29 @@ class NumpyNDArrayWrappedDict(dict):
         """
         raise TypeError("We cannot update this kind of dict this way!")
 
-    def __iter__(self) -> Generator[tuple[str, ...], None, None]:
+    def __iter__(self) -> Iterator[tuple[str, ...]]:
         """
         Iterate over all possible key tuples in the dictionary.
 
-        Yields
-        ------
-        Tuple[str, ...]
-            A tuple of string keys, one for each dimension of the array.
+        Returns
+        -------
+        Iterator[Tuple[str, ...]]
+            An iterator over the tuples of string keys, one for each dimension of the array.
         """
-        for keywords_tuple in product(*self._lists_keystrings):
-            yield keywords_tuple
+        # the keys are generated on the fly, in C order, without being stored
+        return product(*self._lists_keystrings)
 
-    def keys(self):
+    def keys(self) -> KeysView:
         """
         Get all possible key tuples in the dictionary.
 
         Returns
         -------
-        list[Tuple[str, ...]]
-            A list of all possible key tuples.
+        KeysView[Tuple[str, ...]]
+            A view of all possible key tuples, iterated in C order. Membership tests are
+            answered by the key-to-index mappings, without going through the keys.
         """
-        return list(self.__iter__())
+        return KeysView(self)
 
     def values(self):
         """
@@ -184,7 +598,8 @@ class NumpyNDArrayWrappedDict(dict):
         list[float]
             A list of all values in the dictionary.
         """
-        return [self.__getitem__(keywords_tuple) for keywords_tuple in self.__iter__()]
+        # C-order flattening follows the same order as the iteration over the keys
+        return self.to_numpy().ravel().tolist()
 
     def items(self):
         """
@@ -195,10 +610,7 @@ class NumpyNDArrayWrappedDict(dict):
         list[Tuple[Tuple[str, ...], float]]
             A list of all key-value pairs in the dictionary.
         """
-        return [
-            (keywords_tuple, self.__getitem__(keywords_tuple))
-            for keywords_tuple in self.__iter__()
-        ]
+        return list(zip(self, self.to_numpy().ravel().tolist()))
 
     def to_numpy(self) -> np.ndarray:
         """
@@ -223,7 +635,8 @@ class NumpyNDArrayWrappedDict(dict):
         Returns
         -------
         NumpyNDArrayWrappedDict
-            A new NumpyNDArrayWrappedDict with the same keys but different values.
+            A new NumpyNDArrayWrappedDict with the same keys but different values,
+            of the data type of nparray.
 
         Raises
         ------
@@ -236,8 +649,10 @@ class NumpyNDArrayWrappedDict(dict):
             raise WrongArrayDimensionException(self.tensor_dimensions, len(nparray.shape))
         if nparray.shape != self._numpyarray.shape:
             raise WrongArrayShapeException(self._numpyarray.shape, nparray.shape)
-        wrapped_dict = NumpyNDArrayWrappedDict(self._lists_keystrings)
-        wrapped_dict._numpyarray = nparray
+        # the keys are already validated, so they are shared instead of being processed again
+        wrapped_dict = object.__new__(NumpyNDArrayWrappedDict)
+        self._copy_metadata(wrapped_dict)
+        wrapped_dict._set_numpyarray(nparray)
         return wrapped_dict
 
     def __repr__(self) -> str:
@@ -309,9 +724,7 @@ class NumpyNDArrayWrappedDict(dict):
         dict[Tuple[str, ...], float]
             A standard Python dictionary with the same keys and values as the wrapped dictionary.
         """
-        return {
-            keywords_tuple: value for keywords_tuple, value in self.items()
-        }
+        return dict(zip(self, self.to_numpy().ravel().tolist()))
 
     def to_jsonfriendly_dict(self) -> dict[str, float]:
         """
@@ -363,7 +776,9 @@ class NumpyNDArrayWrappedDict(dict):
             cls,
             lists_keywords: list[list[str]],
             oridict: dict[tuple[str, ...], float],
-            default_initial_value: float = 0.0
+            default_initial_value: float = 0.0,
+            *,
+            dtype: npt.DTypeLike = np.float64
     ) -> Self:
         """
         Create a new NumpyNDArrayWrappedDict from a standard Python dictionary with given keywords.
@@ -376,6 +791,8 @@ class NumpyNDArrayWrappedDict(dict):
             A standard Python dictionary with keys as tuples of strings and values as floats.
         default_initial_value : float, optional
             The default value to fill the array with for keys not present in oridict, by default 0.0.
+        dtype : data-type, optional
+            The data type of the values, by default np.float64.
 
         Returns
         -------
@@ -384,17 +801,26 @@ class NumpyNDArrayWrappedDict(dict):
         """
         wrapped_dict = NumpyNDArrayWrappedDict(
             lists_keywords,
-            default_initial_value=default_initial_value
+            default_initial_value=default_initial_value,
+            dtype=dtype
+        )
+        # only the non-default entries of oridict are written, with one scatter into the array
+        entries = wrapped_dict._get_nondefault_entries(oridict, default_initial_value)
+        coords = wrapped_dict._get_coords([keywords_tuple for keywords_tuple, _ in entries])
+        wrapped_dict._numpyarray[tuple(coords)] = np.fromiter(
+            (value for _, value in entries),
+            dtype=wrapped_dict._numpyarray.dtype,
+            count=len(entries)
         )
-        for keywords_tuple in product(*lists_keywords):
-            wrapped_dict[keywords_tuple] = oridict.get(keywords_tuple, default_initial_value)
         return wrapped_dict
 
     @classmethod
     def from_dict(
             cls,
             oridict: dict[tuple[str, ...], float],
-            default_initial_value: float = 0.0
+            default_initial_value: float = 0.0,
+            *,
+            dtype: npt.DTypeLike = np.float64
     ) -> Self:
         """
         Create a new NumpyNDArrayWrappedDict from a standard Python dictionary.
@@ -407,21 +833,31 @@ class NumpyNDArrayWrappedDict(dict):
             A standard Python dictionary with keys as tuples of strings and values as floats.
         default_initial_value : float, optional
             The default value to fill the array with for keys not present in oridict, by default 0.0.
+        dtype : data-type, optional
+            The data type of the values, by default np.float64.
 
         Returns
         -------
         NumpyNDArrayWrappedDict
             A new NumpyNDArrayWrappedDict with the same keys and values as oridict.
+            The keys of each dimension are in the order they first appear in oridict.
+
+        Raises
+        ------
+        WrongArrayDimensionException
+            If the key tuples of oridict do not all have the same length.
         """
         nbdims = len(next(iter(oridict)))
-        lists_keystrings = [
-            list(set(keystring[i] for keystring in oridict.keys()))
-            for i in range(nbdims)
-        ]
+        wrong_lengths = set(map(len, oridict)) - {nbdims}
+        if wrong_lengths:
+            raise WrongArrayDimensionException(nbdims, wrong_lengths.pop())
+        # one transposition of the keys, then an insertion-ordered deduplication of each dimension
+        lists_keystrings = [list(dict.fromkeys(keystrings)) for keystrings in zip(*oridict)]
         return cls.from_dict_given_keywords(
             lists_keystrings,
             oridict,
-            default_initial_value=default_initial_value
+            default_initial_value=default_initial_value,
+            dtype=dtype
         )
 
     @classmethod
@@ -452,7 +888,7 @@ class NumpyNDArrayWrappedDict(dict):
         WrongArrayDimensionException
             If the number of dimensions in the array does not match the number of keyword lists.
         """
-        wrapped_dict = NumpyNDArrayWrappedDict(lists_keywords)
+        wrapped_dict = NumpyNDArrayWrappedDict(lists_keywords, _skip_fill=True)
         try:
             assert wrapped_dict.tensor_dimensions == len(numarray.shape)
         except AssertionError:
@@ -462,7 +898,7 @@ class NumpyNDArrayWrappedDict(dict):
                 assert len(list_keywords) == dimension
             except AssertionError:
                 raise WrongArrayDimensionException(len(list_keywords), dimension)
-        wrapped_dict._numpyarray = numarray
+        wrapped_dict._set_numpyarray(numarray)
         return wrapped_dict
 
     @property
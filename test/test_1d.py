@@ -16,6 +16,19 @@ class Test1DCases(unittest.TestCase):
         self.assertAlmostEqual(array['b'], 2.0)
         self.assertAlmostEqual(array[('c',)], 3.0)
         self.assertAlmostEqual(array['d'], 4.0)
+        self.assertEqual(array.get_many(['a', ('c',), 'd']).tolist(), [1.0, 3.0, 4.0])
+        self.assertEqual(array.to_numpy().tolist(), [1.0, 2.0, 3.0, 4.0])
+        with self.assertRaises(KeyError):
+            _ = array['e']
+        with self.assertRaises(KeyError):
+            _ = array[('e',)]
+
+    def test_from_dict_given_keywords_ignores_string_keys(self):
+        oridict = {'a': 1.0, ('b',): 2.0}
+        array = NumpyNDArrayWrappedDict.from_dict_given_keywords([['a', 'b']], oridict)
+        self.assertEqual(array.to_numpy().tolist(), [0.0, 2.0])
+        sparse_array = SparseArrayWrappedDict.from_dict_given_keywords([['a', 'b']], oridict)
+        self.assertEqual(sparse_array.to_numpy().tolist(), [0.0, 2.0])
 
     def test_sparse_dict(self):
         array = SparseArrayWrappedDict([['a', 'b', 'c', 'd']], default_initial_value=100.0)
@@ -27,6 +40,30 @@ class Test1DCases(unittest.TestCase):
         self.assertAlmostEqual(array[('c',)], 100.0)
         self.assertAlmostEqual(array['d'], 2.5)
 
+        coo_array = SparseArrayWrappedDict([['a', 'b', 'c', 'd']], default_initial_value=100.0, storage="coo")
+        coo_array['b'] = 1.0
+        coo_array[('d',)] = 2.5
+        self.assertAlmostEqual(coo_array['b'], 1.0)
+        self.assertEqual(coo_array.to_numpy().tolist(), [100.0, 1.0, 100.0, 2.5])
+
+        with self.assertRaises(ValueError):
+            SparseArrayWrappedDict([['a', 'b']], storage="csr")
+        with self.assertRaises(ValueError):
+            SparseArrayWrappedDict.from_dict_given_keywords([['a', 'b']], {('a',): 1.0}, storage="csr")
+        auto_array = SparseArrayWrappedDict.from_dict_given_keywords([['a', 'b']], {('a',): 1.0}, storage="auto")
+        self.assertEqual(auto_array.storage, "dok")
+
+    def test_non_string_keys(self):
+        array = NumpyNDArrayWrappedDict([[1, 2]])
+        array[2] = 3.0
+        self.assertEqual(array[1], 0.0)
+        self.assertEqual(array[(2,)], 3.0)
+        for storage in ["dok", "coo"]:
+            sparse_array = SparseArrayWrappedDict([[1, 2]], storage=storage)
+            sparse_array[2] = 3.0
+            self.assertEqual(sparse_array[1], 0.0)
+            self.assertEqual(sparse_array[(2,)], 3.0)
+
 
 if __name__ == '__main__':
     unittest.main()
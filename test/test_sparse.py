@@ -1,5 +1,8 @@
 
+import copy
+import gc
 import unittest
+import weakref
 from itertools import product
 
 import numpy as np
@@ -28,6 +31,9 @@ class TestSparseArrayWrappedDict(unittest.TestCase):
         with self.assertRaises(DuplicatedKeyError):
             SparseArrayWrappedDict([['a', 'a'], ['b', 'c']])
 
+    def test_slots(self):
+        self.assertFalse(hasattr(self.wrapped_dict, '__dict__'))
+
     def test_getitem_setitem(self):
         self.wrapped_dict[('a', 'd')] = 2.0
         self.assertEqual(self.wrapped_dict[('a', 'd')], 2.0)
@@ -76,6 +82,27 @@ class TestSparseArrayWrappedDict(unittest.TestCase):
         self.assertIsInstance(new_dense_dict, NumpyNDArrayWrappedDict)
         np.testing.assert_array_equal(new_dense_dict.to_numpy(), new_sparse_array.todense())
 
+    def test_generate_dict_storage(self):
+        new_array = np.array([[0., 2.], [0., 0.], [3., 0.]])
+        coo_dict = self.wrapped_dict.generate_dict(sparse.COO.from_numpy(new_array))
+        self.assertEqual(coo_dict.storage, "coo")
+        np.testing.assert_array_equal(coo_dict.to_numpy(), new_array)
+
+        numpy_dict = self.wrapped_dict.generate_dict(new_array)
+        self.assertEqual(numpy_dict.storage, "coo")
+        self.assertEqual(numpy_dict['c', 'd'], 3.0)
+
+        dok_dict = self.wrapped_dict.generate_dict(new_array, prefer_coo=False)
+        self.assertEqual(dok_dict.storage, "dok")
+        np.testing.assert_array_equal(dok_dict.to_numpy(), new_array)
+
+        dok_dict['b', 'd'] = 4.0
+        coo_dict['b', 'e'] = 5.0
+        self.assertEqual(dok_dict['b', 'd'], 4.0)
+        self.assertEqual(coo_dict['b', 'e'], 5.0)
+        self.assertEqual(self.wrapped_dict['b', 'd'], 1.0)
+        self.assertEqual(self.wrapped_dict['b', 'e'], 1.0)
+
     def test_generate_dict_wrong_shape(self):
         new_array = sparse.DOK((2, 3))
         with self.assertRaises(WrongArrayShapeException):
@@ -92,6 +119,18 @@ class TestSparseArrayWrappedDict(unittest.TestCase):
         self.assertEqual(wrapped[('c', 'e')], 20.0)
         self.assertEqual(wrapped[('b', 'd')], -1.0)
 
+    def test_from_dict_given_keywords_stores_only_nondefaults(self):
+        d = {('a', 'd'): 10.0, ('b', 'e'): -1.0, ('z', 'd'): 5.0}
+        keywords = [['a', 'b', 'c'], ['d', 'e']]
+        wrapped = SparseArrayWrappedDict.from_dict_given_keywords(keywords, d, default_initial_value=-1.0)
+        self.assertEqual(wrapped.to_dok().nnz, 1)
+        self.assertEqual(wrapped[('a', 'd')], 10.0)
+        self.assertEqual(wrapped[('b', 'e')], -1.0)
+        np.testing.assert_array_equal(
+            wrapped.to_numpy(),
+            np.array([[10., -1.], [-1., -1.], [-1., -1.]])
+        )
+
     def test_dense_to_sparse(self):
         lists_keystrings = [
             ['a', 'b', 'c'],
@@ -110,6 +149,11 @@ class TestSparseArrayWrappedDict(unittest.TestCase):
         for keywords_tuple in product(*lists_keystrings):
             print(f"{keywords_tuple}: {wrapped_dict[keywords_tuple]} vs {sparse_wrapped_dict[keywords_tuple]}")
             assert wrapped_dict[keywords_tuple] == sparse_wrapped_dict[keywords_tuple]
+        self.assertEqual(sparse_wrapped_dict.to_dok().nnz, 3)
+
+    def test_sparse_to_sparse(self):
+        with self.assertRaises(TypeError):
+            SparseArrayWrappedDict.from_NumpyNDArrayWrappedDict(self.wrapped_dict)
 
     def test_from_sparse(self):
         sparse_wrapped_dict = SparseArrayWrappedDict.from_sparsearray_given_keywords(
@@ -119,9 +163,175 @@ class TestSparseArrayWrappedDict(unittest.TestCase):
         for keywords1, keywords2 in product(self.lists_keystrings[0], self.lists_keystrings[1]):
             assert sparse_wrapped_dict[keywords1, keywords2] == self.wrapped_dict[keywords1, keywords2]
 
+    def test_values_items(self):
+        self.wrapped_dict[('a', 'e')] = 3.0
+        self.wrapped_dict[('c', 'd')] = 4.0
+        self.assertEqual(self.wrapped_dict.values(), [1.0, 3.0, 1.0, 1.0, 4.0, 1.0])
+        self.assertIn((('c', 'd'), 4.0), self.wrapped_dict.items())
+        self.assertEqual(self.wrapped_dict.to_dict()[('a', 'e')], 3.0)
+
     def test_sparse(self):
         assert self.wrapped_dict.is_sparse()
 
+    def test_coo_storage(self):
+        wrapped_dict = SparseArrayWrappedDict(self.lists_keystrings, default_initial_value=1.0, storage="coo")
+        self.assertEqual(wrapped_dict.storage, "coo")
+        wrapped_dict['a', 'd'] = 3.0
+        wrapped_dict['b', 'e'] = 4.0
+        self.assertEqual(wrapped_dict['a', 'd'], 3.0)
+        np.testing.assert_array_equal(wrapped_dict.to_numpy(), np.array([[3., 1.], [1., 4.], [1., 1.]]))
+
+        # overwrite an existing entry and reset another one to the default value
+        wrapped_dict['a', 'd'] = 5.0
+        wrapped_dict['b', 'e'] = 1.0
+        coo = wrapped_dict.to_coo()
+        self.assertIsInstance(coo, sparse.COO)
+        self.assertEqual(coo.nnz, 1)
+        self.assertEqual(wrapped_dict['a', 'd'], 5.0)
+        self.assertEqual(wrapped_dict['b', 'e'], 1.0)
+        self.assertEqual(wrapped_dict.to_dok()[0, 0], 5.0)
+
+    def test_get_many_set_many(self):
+        for storage in ["dok", "coo", "csr"]:
+            wrapped_dict = SparseArrayWrappedDict(self.lists_keystrings, default_initial_value=1.0, storage=storage)
+            wrapped_dict.set_many([('a', 'd'), ('b', 'e'), ('a', 'd')], [2.0, 3.0, 4.0])
+            np.testing.assert_array_equal(
+                wrapped_dict.get_many([('a', 'd'), ('b', 'e'), ('c', 'd')]),
+                np.array([4.0, 3.0, 1.0])
+            )
+            self.assertEqual(wrapped_dict['b', 'e'], 3.0)
+
+            wrapped_dict.set_many([('a', 'd'), ('b', 'e')], 1.0)
+            self.assertEqual(wrapped_dict.to_coo().nnz, 0)
+
+            with self.assertRaises(WrongArrayDimensionException):
+                wrapped_dict.get_many([('a',)])
+
+    def test_index_cache(self):
+        wrapped_dict = SparseArrayWrappedDict(self.lists_keystrings, index_cache_maxsize=1)
+        wrapped_dict['a', 'd'] = 2.0
+        wrapped_dict['b', 'e'] = 3.0
+        self.assertEqual(wrapped_dict['a', 'd'], 2.0)
+        self.assertEqual(wrapped_dict['a', 'd'], 2.0)
+        self.assertEqual(wrapped_dict['b', 'e'], 3.0)
+        self.assertEqual(wrapped_dict._index_cache.cache_info().hits, 1)
+        with self.assertRaises(KeyError):
+            _ = wrapped_dict['a', 'f']
+
+    def test_freed_without_garbage_collection(self):
+        gc.disable()
+        try:
+            wrapped_dict = SparseArrayWrappedDict(self.lists_keystrings)
+            wrapped_dict['a', 'd'] = 2.0
+            array_ref = weakref.ref(wrapped_dict.to_dok())
+            generated_dict = wrapped_dict.generate_dict(sparse.DOK((3, 2)))
+            del wrapped_dict
+            self.assertIsNone(array_ref())
+            self.assertEqual(generated_dict['a', 'd'], 0.0)
+        finally:
+            gc.enable()
+
+    def test_copy(self):
+        for storage in ["dok", "coo", "csr"]:
+            wrapped_dict = SparseArrayWrappedDict(self.lists_keystrings, default_initial_value=1.0, storage=storage)
+            wrapped_dict['b', 'e'] = 3.0
+            shallow_copy = copy.copy(wrapped_dict)
+            self.assertEqual(shallow_copy.storage, storage)
+            self.assertEqual(shallow_copy['b', 'e'], 3.0)
+
+            deep_copy = copy.deepcopy(wrapped_dict)
+            self.assertEqual(deep_copy.storage, storage)
+            deep_copy['a', 'd'] = 5.0
+            self.assertEqual(deep_copy['a', 'd'], 5.0)
+            self.assertEqual(deep_copy['b', 'e'], 3.0)
+            self.assertEqual(wrapped_dict['a', 'd'], 1.0)
+            self.assertIsNot(deep_copy._index_cache, wrapped_dict._index_cache)
+
+    def test_csr_storage(self):
+        wrapped_dict = SparseArrayWrappedDict(self.lists_keystrings, default_initial_value=1.0, storage="csr")
+        wrapped_dict['a', 'd'] = 3.0
+        wrapped_dict['c', 'e'] = 4.0
+        self.assertEqual(wrapped_dict['a', 'd'], 3.0)
+        np.testing.assert_array_equal(wrapped_dict.to_numpy(), np.array([[3., 1.], [1., 1.], [1., 4.]]))
+        self.assertIsInstance(wrapped_dict.to_coo(), sparse.COO)
+        self.assertEqual(wrapped_dict['c', 'e'], 4.0)
+        self.assertEqual(wrapped_dict['b', 'e'], 1.0)
+
+    def test_automatic_storage(self):
+        keywords = [['a', 'b', 'c'], ['d', 'e']]
+        sparser = SparseArrayWrappedDict.from_dict_given_keywords(keywords, {}, storage="auto")
+        self.assertEqual(sparser.storage, "dok")
+        denser_dict = {('a', 'd'): 1.0, ('c', 'e'): 2.0}
+        denser = SparseArrayWrappedDict.from_dict_given_keywords(keywords, denser_dict, storage="auto")
+        self.assertEqual(denser.storage, "csr")
+        self.assertEqual(denser['c', 'e'], 2.0)
+        default = SparseArrayWrappedDict.from_dict_given_keywords(keywords, denser_dict)
+        self.assertEqual(default.storage, "dok")
+        self.assertEqual(default['c', 'e'], 2.0)
+
+        dense_dict = NumpyNDArrayWrappedDict.from_dict_given_keywords(keywords, denser_dict)
+        self.assertEqual(SparseArrayWrappedDict.from_NumpyNDArrayWrappedDict(dense_dict).storage, "dok")
+        self.assertEqual(
+            SparseArrayWrappedDict.from_NumpyNDArrayWrappedDict(dense_dict, storage="auto").storage,
+            "csr"
+        )
+        explicit = SparseArrayWrappedDict.from_dict_given_keywords(keywords, {('a', 'd'): 1.0}, storage="coo")
+        self.assertEqual(explicit.storage, "coo")
+
+    def test_dtype(self):
+        for storage in ["dok", "coo", "csr"]:
+            wrapped_dict = SparseArrayWrappedDict(self.lists_keystrings, storage=storage, dtype=np.float32)
+            wrapped_dict['a', 'd'] = 0.5
+            wrapped_dict.set_many([('b', 'e')], 0.25)
+            self.assertEqual(wrapped_dict.to_numpy().dtype, np.float32)
+            self.assertEqual(wrapped_dict['a', 'd'], 0.5)
+        keywords = [['a', 'b', 'c'], ['d', 'e']]
+        wrapped_dict = SparseArrayWrappedDict.from_dict_given_keywords(keywords, {('a', 'd'): 1.0}, dtype=np.float32)
+        self.assertEqual(wrapped_dict.to_coo().dtype, np.float32)
+        dense_dict = NumpyNDArrayWrappedDict(keywords, dtype=np.float32)
+        self.assertEqual(SparseArrayWrappedDict.from_NumpyNDArrayWrappedDict(dense_dict).to_dok().dtype, np.float32)
+
+    def test_buffered_writes_cast_to_dtype(self):
+        for storage in ["dok", "coo", "csr"]:
+            wrapped_dict = SparseArrayWrappedDict(self.lists_keystrings, storage=storage, dtype=np.int64)
+            wrapped_dict['a', 'd'] = 1.7
+            self.assertEqual(wrapped_dict['a', 'd'], 1)
+            self.assertIsInstance(wrapped_dict['a', 'd'], np.int64)
+            wrapped_dict.to_numpy()
+            self.assertEqual(wrapped_dict['a', 'd'], 1)
+            self.assertIsInstance(wrapped_dict['a', 'd'], np.int64)
+
+            wrapped_dict = SparseArrayWrappedDict(self.lists_keystrings, storage=storage, dtype=np.float32)
+            wrapped_dict['b', 'e'] = 0.1
+            self.assertIsInstance(wrapped_dict['b', 'e'], np.float32)
+            self.assertEqual(wrapped_dict['b', 'e'], np.float32(0.1))
+            with self.assertRaises(ValueError):
+                wrapped_dict['c', 'd'] = 'oops'
+            self.assertEqual(wrapped_dict.to_numpy()[1, 1], np.float32(0.1))
+
+    def test_wrong_storage(self):
+        with self.assertRaises(ValueError):
+            SparseArrayWrappedDict(self.lists_keystrings, storage="bsr")
+
+    def test_keyword_only_parameters(self):
+        with self.assertRaises(TypeError):
+            SparseArrayWrappedDict(self.lists_keystrings, 1.0, "coo")
+        with self.assertRaises(TypeError):
+            NumpyNDArrayWrappedDict(self.lists_keystrings, 1.0, 16)
+
+        keywords = [['a', 'b', 'c'], ['d', 'e']]
+        oridict = {('a', 'd'): 2.0}
+        for cls in [NumpyNDArrayWrappedDict, SparseArrayWrappedDict]:
+            with self.assertRaises(TypeError):
+                cls.from_dict_given_keywords(keywords, oridict, 0.0, np.float32)
+            with self.assertRaises(TypeError):
+                cls.from_dict(oridict, 0.0, np.float32)
+            wrapped_dict = cls.from_dict_given_keywords(keywords, oridict, 0.0, dtype=np.float32)
+            self.assertEqual(wrapped_dict['a', 'd'], 2.0)
+            self.assertEqual(cls.from_dict(oridict, 0.0, dtype=np.float32).to_numpy().dtype, np.float32)
+        with self.assertRaises(TypeError):
+            SparseArrayWrappedDict.from_NumpyNDArrayWrappedDict(NumpyNDArrayWrappedDict(keywords), 0.0, "coo")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
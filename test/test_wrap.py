@@ -1,5 +1,11 @@
 
+import copy
+import gc
+import pickle
+import sys
 import unittest
+import weakref
+from collections.abc import KeysView, Mapping
 from itertools import product
 
 import numpy as np
@@ -38,6 +44,50 @@ class TestNumpyNDArrayWrappedDict(unittest.TestCase):
             _ = self.wrapped_dict[('a',)]
             _ = self.wrapped_dict['a']
 
+    def test_exception_messages(self):
+        with self.assertRaises(WrongArrayDimensionException) as context:
+            _ = self.wrapped_dict[('a',)]
+        self.assertEqual(str(context.exception), "Expected dimension: 2, but 1 dimensions are given!")
+        with self.assertRaises(WrongArrayShapeException) as context:
+            self.wrapped_dict.generate_dict(np.zeros((2, 3)))
+        self.assertEqual(str(context.exception), "Expected shape: 3, 2, but the given array shape is 2, 3!")
+        with self.assertRaises(DuplicatedKeyError) as context:
+            NumpyNDArrayWrappedDict([['a', 'a']])
+        self.assertEqual(str(context.exception), "Duplicated keys!")
+
+    def test_exceptions_pickle(self):
+        for exception in [
+            DuplicatedKeyError(),
+            WrongArrayDimensionException(2, 1),
+            WrongArrayShapeException((3, 2), (2, 3))
+        ]:
+            unpickled_exception = pickle.loads(pickle.dumps(exception))
+            self.assertIs(type(unpickled_exception), type(exception))
+            self.assertEqual(str(unpickled_exception), str(exception))
+
+    def test_index_cache(self):
+        wrapped_dict = NumpyNDArrayWrappedDict(self.lists_keystrings, index_cache_maxsize=2)
+        wrapped_dict['a', 'd'] = 2.0
+        self.assertEqual(wrapped_dict['a', 'd'], 2.0)
+        self.assertEqual(wrapped_dict._index_cache.cache_info().hits, 1)
+        uncached_dict = NumpyNDArrayWrappedDict(self.lists_keystrings, index_cache_maxsize=0)
+        uncached_dict['a', 'd'] = 2.0
+        self.assertEqual(uncached_dict['a', 'd'], 2.0)
+        self.assertEqual(uncached_dict._index_cache.cache_info().hits, 0)
+
+    def test_freed_without_garbage_collection(self):
+        gc.disable()
+        try:
+            wrapped_dict = NumpyNDArrayWrappedDict(self.lists_keystrings)
+            wrapped_dict['a', 'd'] = 2.0
+            array_ref = weakref.ref(wrapped_dict.to_numpy())
+            generated_dict = wrapped_dict.generate_dict(np.zeros((3, 2)))
+            del wrapped_dict
+            self.assertIsNone(array_ref())
+            self.assertEqual(generated_dict['a', 'd'], 0.0)
+        finally:
+            gc.enable()
+
     def test_setitem(self):
         self.wrapped_dict[('b', 'e')] = 3.0
         self.assertEqual(self.wrapped_dict[('b', 'e')], 3.0)
@@ -47,11 +97,73 @@ class TestNumpyNDArrayWrappedDict(unittest.TestCase):
         self.assertEqual(self.wrapped_dict['b', 'e'], 3.1)
         self.assertEqual(self.wrapped_dict.to_numpy()[1, 1], 3.1)
 
+    def test_get_many_set_many(self):
+        self.wrapped_dict.set_many([('a', 'd'), ('c', 'e'), ('a', 'd')], [2.0, 3.0, 4.0])
+        np.testing.assert_array_equal(
+            self.wrapped_dict.get_many([('a', 'd'), ('c', 'e'), ('b', 'd')]),
+            np.array([4.0, 3.0, 1.0])
+        )
+        self.assertEqual(self.wrapped_dict['c', 'e'], 3.0)
+
+        self.wrapped_dict.set_many([('a', 'd'), ('c', 'e')], 0.5)
+        np.testing.assert_array_equal(self.wrapped_dict.to_numpy(), np.array([[0.5, 1.], [1., 1.], [1., 0.5]]))
+        self.assertEqual(self.wrapped_dict.get_many([]).shape, (0,))
+
+        with self.assertRaises(WrongArrayDimensionException):
+            self.wrapped_dict.get_many([('a',)])
+        with self.assertRaises(WrongArrayDimensionException):
+            self.wrapped_dict.get_many([('a', 'd'), 'be'])
+        with self.assertRaises(KeyError):
+            self.wrapped_dict.set_many([('a', 'f')], 1.0)
+
+    def test_higher_dimensions(self):
+        for nbdims in range(1, 6):
+            lists_keystrings = [[f'{dim}{i}' for i in range(dim + 2)] for dim in range(nbdims)]
+            wrapped_dict = NumpyNDArrayWrappedDict(lists_keystrings, index_cache_maxsize=0)
+            for value, keywords_tuple in enumerate(product(*lists_keystrings)):
+                wrapped_dict[keywords_tuple] = value
+            expected_array = np.arange(len(wrapped_dict), dtype=np.float64).reshape(wrapped_dict.dimension_sizes)
+            np.testing.assert_array_equal(wrapped_dict.to_numpy(), expected_array)
+            last_keywords_tuple = tuple(list_keystrings[-1] for list_keystrings in lists_keystrings)
+            self.assertEqual(wrapped_dict[last_keywords_tuple], len(wrapped_dict) - 1)
+
+    def test_dtype(self):
+        wrapped_dict = NumpyNDArrayWrappedDict(self.lists_keystrings, default_initial_value=1.0, dtype=np.float32)
+        wrapped_dict['a', 'd'] = 0.5
+        wrapped_dict.set_many([('b', 'e'), ('c', 'd'), ('b', 'e')], [2.0, 0.75, 0.25])
+        self.assertEqual(wrapped_dict.to_numpy().dtype, np.float32)
+        self.assertEqual(wrapped_dict.get_many([('a', 'd'), ('b', 'e'), ('c', 'd')]).tolist(), [0.5, 0.25, 0.75])
+        self.assertEqual(wrapped_dict.get_many([('a', 'd')]).dtype, np.float32)
+
+        from_dict = NumpyNDArrayWrappedDict.from_dict({('a', 'x'): 3, ('b', 'y'): 4}, dtype=np.int64)
+        self.assertEqual(from_dict.to_numpy().dtype, np.int64)
+        self.assertEqual(from_dict['b', 'y'], 4)
+
     def test_setitem_wrong_dimension(self):
         with self.assertRaises(WrongArrayDimensionException):
             self.wrapped_dict[('a', 'b', 'c')] = 1.0
             self.wrapped_dict['a', 'b', 'c'] = 1.0
 
+    def test_mapping(self):
+        self.assertIsInstance(self.wrapped_dict, Mapping)
+        self.assertIn(('a', 'd'), self.wrapped_dict)
+        self.assertNotIn(('a', 'f'), self.wrapped_dict)
+        self.assertNotIn(('a',), self.wrapped_dict)
+        self.assertNotIn('a', self.wrapped_dict)
+        self.assertNotIn((['a'], 'd'), self.wrapped_dict)
+        self.assertEqual(dict(self.wrapped_dict), self.wrapped_dict.to_dict())
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.wrapped_dict, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.wrapped_dict.new_attribute = 1
+
+    def test_interned_keys(self):
+        keystrings = [''.join(['k', str(i)]) for i in range(3)]
+        wrapped_dict = NumpyNDArrayWrappedDict([keystrings, ['x']])
+        self.assertIs(list(wrapped_dict.keys())[1][0], sys.intern('k1'))
+        self.assertEqual(wrapped_dict[''.join(['k', '2']), 'x'], 0.0)
+
     def test_iteration(self):
         keys = list(self.wrapped_dict)
         self.assertEqual(len(keys), 6)
@@ -62,6 +174,10 @@ class TestNumpyNDArrayWrappedDict(unittest.TestCase):
         keys = self.wrapped_dict.keys()
         self.assertEqual(len(keys), 6)
         self.assertIn(('a', 'd'), keys)
+        self.assertNotIn(('a', 'f'), keys)
+        self.assertIsInstance(keys, KeysView)
+        self.assertEqual(keys, set(product(*self.lists_keystrings)))
+        self.assertEqual(list(keys), list(product(*self.lists_keystrings)))
 
     def test_values(self):
         self.wrapped_dict[('a', 'd')] = 5.0
@@ -91,6 +207,16 @@ class TestNumpyNDArrayWrappedDict(unittest.TestCase):
         self.assertEqual(wrapped[('a', 'y')], 0.0)
         self.assertEqual(wrapped[('b', 'x')], 0.0)
 
+    def test_from_dict_key_order(self):
+        d = {('b', 'y'): 1, ('a', 'y'): 2, ('b', 'x'): 3}
+        wrapped = NumpyNDArrayWrappedDict.from_dict(d)
+        self.assertEqual(wrapped.get_key_index(0, 'b'), 0)
+        self.assertEqual(wrapped.get_key_index(0, 'a'), 1)
+        self.assertEqual(wrapped.get_key_index(1, 'y'), 0)
+        np.testing.assert_array_equal(wrapped.to_numpy(), np.array([[1., 3.], [2., 0.]]))
+        with self.assertRaises(WrongArrayDimensionException):
+            NumpyNDArrayWrappedDict.from_dict({('a', 'x'): 1, ('b',): 2})
+
     def test_from_dict_given_keywords(self):
         d = {('a', 'x'): 1}
         keywords = [['a', 'b'], ['x', 'y']]
@@ -98,6 +224,18 @@ class TestNumpyNDArrayWrappedDict(unittest.TestCase):
         self.assertEqual(wrapped[('a', 'x')], 1)
         self.assertEqual(wrapped[('b', 'y')], -1)
 
+    def test_from_dict_given_keywords_ignores_unknown_keys(self):
+        d = {('a', 'x'): 1, ('c', 'x'): 2, ('b', 'z'): 3}
+        keywords = [['a', 'b'], ['x', 'y']]
+        wrapped = NumpyNDArrayWrappedDict.from_dict_given_keywords(keywords, d, default_initial_value=-1)
+        np.testing.assert_array_equal(wrapped.to_numpy(), np.array([[1., -1.], [-1., -1.]]))
+
+    def test_from_dict_given_keywords_ignores_string_keys(self):
+        d = {'ax': 2, ('b', 'y'): 3}
+        keywords = [['a', 'b'], ['x', 'y']]
+        wrapped = NumpyNDArrayWrappedDict.from_dict_given_keywords(keywords, d, default_initial_value=-1)
+        np.testing.assert_array_equal(wrapped.to_numpy(), np.array([[-1., -1.], [-1., 3.]]))
+
     def test_repr_str(self):
         self.assertEqual(repr(self.wrapped_dict), f"<NumpyNDArrayWrappedDict: dimensions ({', '.join(map(str, self.wrapped_dict.dimension_sizes))})>")
         self.assertEqual(str(self.wrapped_dict), repr(self.wrapped_dict))
@@ -111,6 +249,37 @@ class TestNumpyNDArrayWrappedDict(unittest.TestCase):
         new_wrapped_dict = self.wrapped_dict.generate_dict(new_array)
         np.testing.assert_array_equal(new_wrapped_dict.to_numpy(), new_array)
         self.assertEqual(new_wrapped_dict.dimension_sizes, self.wrapped_dict.dimension_sizes)
+        new_wrapped_dict['b', 'd'] = 2.0
+        self.assertEqual(new_wrapped_dict['b', 'd'], 2.0)
+        self.assertEqual(self.wrapped_dict['b', 'd'], 1.0)
+        self.assertEqual(list(new_wrapped_dict), list(self.wrapped_dict))
+
+    def test_generate_dict_noncontiguous(self):
+        new_array = np.arange(6, dtype=np.float64).reshape((2, 3)).T
+        new_wrapped_dict = self.wrapped_dict.generate_dict(new_array)
+        self.assertEqual(new_wrapped_dict['b', 'e'], 4.0)
+        self.assertEqual(new_wrapped_dict['c', 'd'], 2.0)
+        new_wrapped_dict['c', 'd'] = 7.0
+        self.assertEqual(new_wrapped_dict.to_numpy()[2, 0], 7.0)
+        self.assertEqual(new_array[2, 0], 7.0)
+        np.testing.assert_array_equal(new_wrapped_dict.get_many([('b', 'e'), ('c', 'd')]), np.array([4.0, 7.0]))
+        new_wrapped_dict.set_many([('a', 'e'), ('b', 'd')], [8.0, 9.0])
+        self.assertEqual(new_array[0, 1], 8.0)
+        self.assertEqual(new_array[1, 0], 9.0)
+
+    def test_copy(self):
+        self.wrapped_dict['b', 'e'] = 3.0
+        shallow_copy = copy.copy(self.wrapped_dict)
+        shallow_copy['a', 'd'] = 4.0
+        self.assertEqual(self.wrapped_dict['a', 'd'], 4.0)
+
+        deep_copy = copy.deepcopy(self.wrapped_dict)
+        self.assertEqual(deep_copy['b', 'e'], 3.0)
+        deep_copy['a', 'd'] = 5.0
+        self.assertEqual(deep_copy.to_numpy()[0, 0], 5.0)
+        self.assertEqual(self.wrapped_dict['a', 'd'], 4.0)
+        self.assertIsNot(deep_copy._index_cache, self.wrapped_dict._index_cache)
+        self.assertEqual(deep_copy._index_cache.cache_info().currsize, 2)
 
     def test_generate_dict_wrong_shape(self):
         new_array = np.zeros((2, 3))